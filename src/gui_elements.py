@@ -1,26 +1,131 @@
 """Module for commonly used gui elements."""
 
 # EXTERNAL
-from typing import Union, Callable, Dict, List, Self, Tuple, Optional
+import asyncio
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Union, Callable, Dict, Iterator, List, Self, Tuple, Optional
 from PySide2 import QtCore
-from PySide2.QtGui import (QIcon, QPixmap)
-from PySide2.QtWidgets import (QWidget, QFrame, QMessageBox, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QSlider,
+from PySide2.QtGui import (QColor, QFont, QIcon, QPixmap)
+from PySide2.QtWidgets import (QApplication, QWidget, QFrame, QMessageBox, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QSlider,
                                QComboBox, QGroupBox, QCheckBox, QSpacerItem, QPushButton, QSizePolicy, QSpinBox,
                                QLayout)
 
 # INTERNAL
 from messaging import (Failure, Success, Logger)
 
+# SHARED FIELD STYLE, WIDGETS OPT IN WITH setProperty('class', 'field')
+_FIELD_QSS = 'QLineEdit[class="field"], QComboBox[class="field"], QSpinBox[class="field"] ' \
+             '{background: gray; selection-background-color: darkgray; border-radius: 7px;}'
+
+# DEFAULT FrameBoxWidget STYLE, WIDGETS OPT IN WITH setProperty('class', 'frame_box')
+_DEFAULT_FRAME_STYLE = 'QFrame[class="frame_box"]{border: 1px solid gray; border-radius: 5px;background-color: none;}'
+
+# PRE-BOUND SIZE POLICY FOR SPACER ITEMS
+_SP_MIN = QSizePolicy.Minimum
+
+
+def _install_app_style(qss: str) -> None:
+    """Append a stylesheet to the running application unless it already carries it.
+
+    Notes:
+        The application stylesheet itself is checked, so the rule is re-appended if the host application
+        replaced its stylesheet or a new QApplication was created.
+
+    Args:
+        qss: style sheet to append.
+    """
+    app = QApplication.instance()
+    if app is None:
+        return
+    current = app.styleSheet()
+    if qss in current:
+        return
+    app.setStyleSheet(current + qss)
+
+
+def _spacer(width: int, height: int = 25) -> QSpacerItem:
+    """Construct a minimum policy spacer item.
+
+    Args:
+        width: width of spacer.
+        height: height of spacer.
+    """
+    return QSpacerItem(width, height, _SP_MIN, _SP_MIN)
+
+
+@functools.lru_cache(maxsize=None)
+def _bold_font() -> QFont:
+    """Return the shared bold label font, built on first use once a QApplication exists."""
+    font = QFont()
+    font.setBold(True)
+    return font
+
+
+def _bold_label(text: str) -> QLabel:
+    """Construct a plain text label drawn with the shared bold font.
+
+    Args:
+        text: text of label.
+    """
+    label = QLabel(text)
+    label.setTextFormat(QtCore.Qt.PlainText)
+    label.setFont(_bold_font())
+    return label
+
+
+@functools.lru_cache(maxsize=None)
+def _load_checkbox_icon(minus: str, plus: str) -> QIcon:
+    """Build the collapse icon for a minus/plus pair once and share it between groups.
+
+    Args:
+        minus: icon path for minus.
+        plus: icon path for plus.
+    """
+    icon = QIcon()
+    icon.addPixmap(QPixmap(minus), QIcon.Normal, QIcon.Off)
+    icon.addPixmap(QPixmap(plus), QIcon.Normal, QIcon.On)
+    return icon
+
 
 class GuiElements(QWidget):
     _log = Logger()
 
+    # PRE-BOUND ENUMS FOR SPACER CONSTRUCTION
+    _HLINE = QFrame.HLine
+    _EXP = QSizePolicy.Expanding
+    _MIN = QSizePolicy.Minimum
+
+    # multi_input_dialog EDITOR CONSTRUCTION AND DEFAULT VALUE SETTERS, KEYED BY ENTRY TYPE
+    # DoubleSlider IS DEFINED LATER IN THE MODULE, SO IT IS RESOLVED AT CALL TIME
+    _FACTORIES = {
+        str: QLineEdit,
+        float: lambda: DoubleSlider(),
+        int: QSlider,
+        list: QComboBox
+    }
+    _SETTERS = {
+        str: lambda item, data: item.setText(data['default']),
+        float: lambda item, data: item.setValue(data['default']),
+        int: lambda item, data: item.setValue(data['default']),
+        list: lambda item, data: item.setCurrentIndex(data['items'].index(data['default']))
+        if data['default'] in data.get('items', []) else None
+    }
+
+    # MESSAGE BOXES ARE BUILT ON FIRST USE AND RECONFIGURED FOR EVERY LATER PROMPT
+    _prompt_box = None
+    _message_box = None
+
+    # STRONG REFERENCES TO RUNNING CALLBACK TASKS, THE EVENT LOOP ONLY HOLDS THEM WEAKLY
+    _callback_tasks = set()
+
     @classmethod
     def horizontal_spacer(cls, line_width: int = 8) -> QFrame:
         """Construct and return a horizontal spacer item."""
         item = QFrame()
-        item.setFrameStyle(QFrame.HLine)
-        item.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
+        item.setFrameStyle(cls._HLINE)
+        item.setSizePolicy(cls._EXP, cls._MIN)
         item.setLineWidth(line_width)
         return item
 
@@ -50,9 +155,37 @@ class GuiElements(QWidget):
             _yes = True if result == QMessageBox.Yes else False
             _no = True if result == QMessageBox.No else False
         """
-        question_box = QMessageBox()
+        question_box = cls._configure_prompt_box(text, informative_text, default_yes, multi_prompt)
+        result = question_box.exec_()
+        return result
+
+    @classmethod
+    async def prompt_question_async(cls, text: str = None, informative_text: str = None, default_yes: bool = False,
+                                    multi_prompt: bool = False) -> int:
+        """Prompts user with a yes/no question without blocking the event loop.
+
+        Notes:
+            Requires an asyncio event loop driven by Qt, e.g. qasync. Every call shows its own message box, so
+            concurrent prompts do not overwrite each other.
+
+        Example:
+            result = await ge.GuiElements.prompt_question_async(text=txt, informative_text=info)
+            _yes = True if result == QMessageBox.Yes else False
+        """
+        question_box = cls._configure_prompt_box(text, informative_text, default_yes, multi_prompt,
+                                                 question_box=cls._new_box())
+        return await cls._wait_for_box(question_box)
+
+    @classmethod
+    def _configure_prompt_box(cls, text: str, informative_text: str, default_yes: bool, multi_prompt: bool,
+                              question_box: QMessageBox = None) -> QMessageBox:
+        """Return question_box, or the shared question box when not given, configured for a prompt."""
+        if question_box is None:
+            if cls._prompt_box is None:
+                cls._prompt_box = cls._new_box()
+            # A PROMPT OPENED WHILE THE SHARED BOX IS STILL SHOWING GETS ITS OWN BOX, A NESTED exec_() RETURNS -1
+            question_box = cls._new_box() if cls._prompt_box.isVisible() else cls._prompt_box
         question_box.setText(text)
-        question_box.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
         question_box.setInformativeText(informative_text)
         question_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         if multi_prompt:
@@ -62,8 +195,7 @@ class GuiElements(QWidget):
             question_box.setDefaultButton(QMessageBox.Yes)
         else:
             question_box.setDefaultButton(QMessageBox.No)
-        result = question_box.exec_()
-        return result
+        return question_box
 
     @classmethod
     def message_box(cls, message: str = None, ok_cancel_option: bool = False) -> bool:
@@ -82,21 +214,96 @@ class GuiElements(QWidget):
             ge.GuiElements.message_box(message=text)
         """
 
-        msgBox = QMessageBox()
-        msgBox.setText(message)
-        msgBox.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
-        if ok_cancel_option:
-            msgBox.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+        msgBox = cls._configure_message_box(message, ok_cancel_option)
         ret = msgBox.exec_()
         if ret == QMessageBox.Ok:
             return True
         else:
             return False
 
+    @classmethod
+    async def message_box_async(cls, message: str = None, ok_cancel_option: bool = False) -> bool:
+        """Create a message box that is always on top without blocking the event loop.
+
+        Notes:
+            Requires an asyncio event loop driven by Qt, e.g. qasync. Every call shows its own message box, so
+            concurrent messages do not overwrite each other.
+
+        Args:
+            message: message to convey to user.
+            ok_cancel_option: when True, provide the user with an Ok, Cancel option.
+        """
+        msgBox = cls._configure_message_box(message, ok_cancel_option, msg_box=cls._new_box())
+        ret = await cls._wait_for_box(msgBox)
+        return ret == QMessageBox.Ok
+
+    @classmethod
+    def _configure_message_box(cls, message: str, ok_cancel_option: bool,
+                               msg_box: QMessageBox = None) -> QMessageBox:
+        """Return msg_box, or the shared message box when not given, configured for a message."""
+        if msg_box is None:
+            if cls._message_box is None:
+                cls._message_box = cls._new_box()
+            # A MESSAGE OPENED WHILE THE SHARED BOX IS STILL SHOWING GETS ITS OWN BOX, A NESTED exec_() RETURNS -1
+            msg_box = cls._new_box() if cls._message_box.isVisible() else cls._message_box
+        msgBox = msg_box
+        msgBox.setText(message)
+        if ok_cancel_option:
+            msgBox.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+        else:
+            msgBox.setStandardButtons(QMessageBox.Ok)
+        return msgBox
+
+    @staticmethod
+    def _new_box() -> QMessageBox:
+        """Construct a message box that is always on top."""
+        box = QMessageBox()
+        box.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
+        return box
+
+    @staticmethod
+    async def _wait_for_box(box: QMessageBox) -> int:
+        """Show a dedicated message box, wait for the button it was closed with, then schedule its deletion.
+
+        Args:
+            box: message box to show.
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        def _on_finished(result: int) -> None:
+            if not future.done():
+                future.set_result(result)
+
+        box.finished.connect(_on_finished)
+        box.show()
+        try:
+            return await future
+        finally:
+            box.finished.disconnect(_on_finished)
+            box.deleteLater()
+
+    @classmethod
+    def _as_slot(cls, callback: Callable) -> Callable:
+        """Return a slot for callback, scheduling coroutine functions as tasks so they do not block the ui.
+
+        Args:
+            callback: function or coroutine function to connect.
+        """
+        if not inspect.iscoroutinefunction(callback):
+            return callback
+
+        def _schedule() -> None:
+            # RAISES RuntimeError WHEN NO EVENT LOOP IS RUNNING INSTEAD OF QUEUEING ON ONE THAT NEVER RUNS
+            task = asyncio.get_running_loop().create_task(callback())
+            cls._callback_tasks.add(task)
+            task.add_done_callback(cls._callback_tasks.discard)
+
+        return _schedule
+
     @classmethod
     def multi_input_dialog(cls, parent: QWidget = None, title: str = 'Multiple Input Dialog Box', header: str = None,
                            data: Dict = None, yes_label: str = 'Yes', no_label: str = 'No',
-                           yes_callback: Callable = None, no_callback: Callable = None) -> List:
+                           yes_callback: Callable = None, no_callback: Callable = None) -> QWidget:
         """Create a multi prompt popup window allowing the calling code to query data from the user.
 
         Args:
@@ -111,9 +318,15 @@ class GuiElements(QWidget):
                              'default' (default data_type value): the default value
                              'help' (str): popup help information
                              'items' (list): list type ONLY, items to display in the list
-                             'label' (str): label for item
-            yes_callback: method to call when yes button is pressed
-            no_callback: method to call when no button is pressed (OPTIONAL)
+                             'label' (str): label for item, defaults to the entry's key
+            yes_callback: method to call when yes button is pressed. Coroutine functions are scheduled as tasks
+                          and require an asyncio event loop driven by Qt, e.g. qasync.
+            no_callback: method to call when no button is pressed (OPTIONAL). Coroutine functions are scheduled as
+                         tasks and require an asyncio event loop driven by Qt, e.g. qasync.
+
+        Notes:
+            The fields are constructed the first time the window is shown. Once shown, each editor is available
+            through the returned widget's items dictionary, keyed the same as data.
 
         Example:
             from gui_elements import GuiElements
@@ -135,61 +348,25 @@ class GuiElements(QWidget):
 
             result = GuiElements.multi_input_dialog(title=_title, header=_header, yes_label=_yes, no_label=_no, data=_data)
         """
-        widget = QWidget(parent)
+        widget = _MultiInputDialog(parent)
         layout = QVBoxLayout()
         header_widget = QLabel(header)
         layout.addWidget(header_widget)
 
-        hbox = QHBoxLayout()
-        label = QLabel(data['label'])
-        if 'type' in data:
-            item = None
-            if data['type'] == str:
-                item = QLineEdit()
-            elif data['type'] == float:
-                item = DoubleSlider()
-            elif data['type'] == int:
-                item = QSlider()
-            elif data['type'] == list:
-                item = QComboBox()
-
-            if item:
-                # SET MIN MAX VALUES FOR SLIDERS
-                if data['type'] == float or data['type'] == int:
-                    if 'min' in data or 'max' in data:
-                        if 'min' in data:
-                            item.setMinimum(data['min'])
-                        if 'max' in data:
-                            item.setMaximum(data['max'])
-                # POPULATE LIST
-                if 'items' in data and data['type'] == list:
-                    for list_item in data['items']:
-                        item.addItem(str(list_item))
-                # SET DEFAULTS
-                if 'default' in data:
-                    if data['type'] == str:
-                        item.setText(data['default'])
-                    elif data['type'] == float or data['type'] == int:
-                        item.setValue(data['default'])
-                    elif data['type'] == list:
-                        if data['default'] in data['items']:
-                            item.setCurrentIndex(data['items'].index(data['default']))
-
-                if 'help' in data:
-                    item.setToolTip(data['help'])
-            hbox.addWidget(label)
-            hbox.addWidget(item)
-            widget.item = item
-            layout.addLayout(hbox)
+        # FIELDS ARE BUILT ON FIRST SHOW, SEE _MultiInputDialog.setVisible
+        layout.addLayout(widget.field_layout)
+        if data:
+            widget._pending_fields.extend(data.items())
 
         # ADD YES NOT BUTTONS
         hbox_buttons = QHBoxLayout()
         yes = QPushButton(yes_label)
         no = QPushButton(no_label)
         if no_callback:
-            no.pressed.connect(lambda: no_callback())
+            no.pressed.connect(cls._as_slot(no_callback))
         no.pressed.connect(widget.close)
-        yes.pressed.connect(lambda: yes_callback())
+        if yes_callback:
+            yes.pressed.connect(cls._as_slot(yes_callback))
         hbox_buttons.addWidget(yes)
         hbox_buttons.addWidget(no)
         layout.addLayout(hbox_buttons)
@@ -198,6 +375,64 @@ class GuiElements(QWidget):
 
         return widget
 
+    @classmethod
+    def _build_input_field(cls, data: Dict) -> Optional[QWidget]:
+        """Construct the editor widget described by a single multi_input_dialog entry.
+
+        Args:
+            data: entry describing the item, see multi_input_dialog.
+        """
+        factory = cls._FACTORIES.get(data.get('type'))
+        if not factory:
+            return None
+        data_type = data['type']
+        item = factory()
+
+        # SET MIN MAX VALUES FOR SLIDERS
+        if data_type == float or data_type == int:
+            if 'min' in data:
+                item.setMinimum(data['min'])
+            if 'max' in data:
+                item.setMaximum(data['max'])
+        # POPULATE LIST
+        if 'items' in data and data_type == list:
+            for list_item in data['items']:
+                item.addItem(str(list_item))
+        # SET DEFAULTS
+        if 'default' in data:
+            cls._SETTERS[data_type](item, data)
+
+        if 'help' in data:
+            item.setToolTip(data['help'])
+        return item
+
+
+class _MultiInputDialog(QWidget):
+    """Window returned by GuiElements.multi_input_dialog which builds its fields the first time it is shown."""
+
+    def __init__(self, parent: QWidget = None) -> None:
+        QWidget.__init__(self, parent)
+        self.field_layout = QVBoxLayout()
+        self.items = {}
+        self.item = None
+        self._pending_fields = []
+
+    def setVisible(self, visible: bool) -> None:
+        """Override class method to construct any pending fields before Qt sizes and shows the window."""
+        if visible and self._pending_fields:
+            for name, spec in self._pending_fields:
+                item = GuiElements._build_input_field(spec)
+                if not item:
+                    continue
+                hbox = QHBoxLayout()
+                hbox.addWidget(QLabel(spec.get('label', name)))
+                hbox.addWidget(item)
+                self.field_layout.addLayout(hbox)
+                self.items[name] = item
+                self.item = item
+            self._pending_fields.clear()
+        QWidget.setVisible(self, visible)
+
 
 class DoubleSlider(QSlider):
     """A QSlider with a double value."""
@@ -205,18 +440,14 @@ class DoubleSlider(QSlider):
         QSlider.__init__(self, *args, **kwargs)
 
         # Set integer max and min. These stay constant.
-        self.setMinimum(0)
         self._max_int = 10000
-        self.setMaximum(self._max_int)
+        QSlider.setRange(self, 0, self._max_int)
 
         # The "actual" min and max values seen by user
         self._min_value = 0.0
         self._max_value = 100.0
-
-    @property
-    def _value_range(self) -> float:
-        """Return value range of slider."""
-        return self._max_value - self._min_value
+        self._inv_scale = 0.0
+        self.setRange(self._min_value, self._max_value)
 
     def setMinimum(self, value: float) -> None:
         """Set range of slider."""
@@ -231,23 +462,34 @@ class DoubleSlider(QSlider):
         old_value = self.value()
         self._min_value = minimum
         self._max_value = maximum
+        # CACHE THE INT <-> FLOAT SCALE FACTORS SO VALUE ACCESS IS A SINGLE MULTIPLY
+        self._value_range_f = maximum - minimum
+        self._inv_scale = self._value_range_f / self._max_int
+        self._scale = self._max_int / self._value_range_f if self._value_range_f else 0
         self.setValue(old_value)
 
     def value(self) -> float:
         """Return value of slider."""
-        return float(self.value()) / self._max_int * self._value_range
+        return QSlider.value(self) * self._inv_scale + self._min_value
 
     def setValue(self, value: float) -> None:
         """Set value of slider."""
-        self.setValue(int(value / self._value_range * self._max_int))
+        QSlider.setValue(self, int((value - self._min_value) * self._scale))
 
     def proportion(self) -> float:
         """Return proportion of slider."""
-        return (self.value() - self._min_value) / self._value_range
+        return QSlider.value(self) / self._max_int
 
 
 class Group(QGroupBox):
-    """A collapsible group box."""
+    """A collapsible group box.
+
+    Example:
+        # WRAP LARGE NUMBERS OF ADDITIONS IN batch() SO THE GROUP IS ONLY REPAINTED AND RESIZED ONCE
+        with group.batch():
+            for w in widgets:
+                group.add_widget(w)
+    """
     def __init__(self, title: str, minus_icon: str, plus_icon: str, v_orient: bool = True, init_visible: bool = False,
                  label: str = None, align_label_left: bool = False, button_style: str = None, text_style: str = None,
                  parent: QLayout = None) -> None:
@@ -265,12 +507,10 @@ class Group(QGroupBox):
             plus_icon: icon path for plus.
         """
         QGroupBox.__init__(self, parent)
-        self._insert = "{0}.{1}.".format(self.__module__, self.__class__.__name__)
+        self._insert = f"{self.__module__}.{self.__class__.__name__}."
         self._log = Logger()
 
-        self.CHECKBOX_ICON = QIcon()
-        self.CHECKBOX_ICON.addPixmap(QPixmap("{0}".format(minus_icon)), QIcon.Normal, QIcon.Off)
-        self.CHECKBOX_ICON.addPixmap(QPixmap("{0}".format(plus_icon)), QIcon.Normal, QIcon.On)
+        self.CHECKBOX_ICON = _load_checkbox_icon(minus_icon, plus_icon)
 
         if parent:
             self.parent = parent
@@ -296,7 +536,10 @@ class Group(QGroupBox):
         self.toggle_button.toggled.connect(self.collapse_widgets)
         self.toggle_button.setIcon(self.CHECKBOX_ICON)
         self.toggle_button.setCheckable(True)
-        self.toggle_button.setChecked(False)
+        # START THE BUTTON IN THE INITIAL STATE WITHOUT TRIGGERING A COLLAPSE
+        self.toggle_button.blockSignals(True)
+        self.toggle_button.setChecked(init_visible)
+        self.toggle_button.blockSignals(False)
         self.toggle_button.setFlat(True)
         self.toggle_button.setDefault(False)
         if button_style:
@@ -312,24 +555,27 @@ class Group(QGroupBox):
 
         self._main_widget_container = QWidget()
 
-        self._main_widget_container.setAttribute(QtCore.Qt.WA_StyledBackground, True)
-        style = "icon-size: 20px;" \
-                "background-color: rgb(54, 54, 54);"
-        self._main_widget_container.setStyleSheet(style)
+        # SOLID BACKGROUND GOES THROUGH THE PALETTE, QSS IS ONLY NEEDED FOR THE ICON SIZE
+        palette = self._main_widget_container.palette()
+        palette.setColor(self._main_widget_container.backgroundRole(), QColor(54, 54, 54))
+        self._main_widget_container.setPalette(palette)
+        self._main_widget_container.setAutoFillBackground(True)
+        self._main_widget_container.setStyleSheet("icon-size: 20px;")
 
         self._main_widget_container.setMinimumHeight(25)
         self._main_container.addWidget(self._main_widget_container)
         if v_orient:
-            self._widget_container = QVBoxLayout()
+            self._widget_container = QVBoxLayout(self._main_widget_container)
         else:
-            self._widget_container = QHBoxLayout()
+            self._widget_container = QHBoxLayout(self._main_widget_container)
         self._widget_container.setAlignment(QtCore.Qt.AlignLeft)
         self._widget_container.setContentsMargins(3, 3, 3, 3)
 
-        self._main_widget_container.setLayout(self._widget_container)
-
         self._main_container.addStretch(1)
         self._main_widget_container.setVisible(init_visible)
+        self._visible_state = init_visible
+        # COLLAPSED HEIGHT, MEASURED ON THE FIRST COLLAPSE
+        self._h_collapsed = None
 
         self.setFixedHeight(self.sizeHint().height())
 
@@ -363,13 +609,17 @@ class Group(QGroupBox):
             self._widget_container.addLayout(layout)
             return Success()
         else:
-            msg = "{0}add_layout(): layout Argument missing".format(self._insert)
+            msg = f"{self._insert}add_layout(): layout Argument missing"
             self._log.error(msg)
             return Failure(msg)
 
     def add_widget(self, widget: QWidget) -> Union[Success, Failure]:
         """Add widgets to the classes widget container.
 
+        Notes:
+            When inserting a QGraphicsView, set its viewport update mode to SmartViewportUpdate and its items'
+            cache mode to DeviceCoordinateCache so expanding the group does not repaint the whole scene.
+
         Args:
             widget: widget to insert
         """
@@ -377,24 +627,49 @@ class Group(QGroupBox):
             self._widget_container.addWidget(widget)
             return Success()
         else:
-            msg = "{0}add_widget(): widget Argument missing".format(self._insert)
+            msg = f"{self._insert}add_widget(): widget Argument missing"
             self._log.error(msg)
             return Failure(msg)
 
+    @contextmanager
+    def batch(self) -> Iterator[Self]:
+        """Suspend repaints and signals while populating the group, then resize it once on exit."""
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            yield self
+        finally:
+            self.blockSignals(False)
+            self.setFixedHeight(self.sizeHint().height())
+            self.setUpdatesEnabled(True)
+
     def collapse_widgets(self, state: bool) -> None:
         """
         private method used to collapse the shelves
         Args:
             state: collapse state of widget
         """
-        # IF SINGLE RETURNS FALSE, HIDE BUTTONS
-        if not state:
-            self._main_widget_container.setVisible(False)
-            self.toggle_button.setChecked(False)
+        # KEEP THE BUTTON IN SYNC WHEN CALLED PROGRAMMATICALLY
+        if self.toggle_button.isChecked() != state:
+            self.toggle_button.blockSignals(True)
+            self.toggle_button.setChecked(state)
+            self.toggle_button.blockSignals(False)
+        # NOTHING TO DO IF THE CONTENTS ARE ALREADY IN THE REQUESTED STATE AND THE HEADER IS MEASURED
+        if state == self._visible_state and self._h_collapsed is not None:
+            return
+        # BATCH THE VISIBILITY CHANGE AND RESIZE INTO A SINGLE REPAINT
+        self.setUpdatesEnabled(False)
+        self._main_widget_container.setVisible(state)
+        self._visible_state = state
+        if state:
+            # THE CONTENTS CAN CHANGE SIZE AT ANY TIME (NESTED GROUPS, SHOWN / HIDDEN CHILDREN)
+            self.setFixedHeight(self.sizeHint().height())
         else:
-            self._main_widget_container.setVisible(True)
-            self.toggle_button.setChecked(True)
-        self.setFixedHeight(self.sizeHint().height())
+            # THE COLLAPSED HEIGHT ONLY DEPENDS ON THE HEADER, MEASURE IT ONCE
+            if self._h_collapsed is None:
+                self._h_collapsed = self.sizeHint().height()
+            self.setFixedHeight(self._h_collapsed)
+        self.setUpdatesEnabled(True)
 
     def set_title(self, title: str = None) -> Union[Success, Failure]:
         """Set title of group box.
@@ -404,9 +679,10 @@ class Group(QGroupBox):
         """
         if title:
             self.setTitle(title)
+            self._h_collapsed = None
             return Success()
         else:
-            msg = "{0}set_title(): title Argument missing".format(self._insert)
+            msg = f"{self._insert}set_title(): title Argument missing"
             self._log.error(msg)
             return Failure(msg)
 
@@ -418,9 +694,10 @@ class Group(QGroupBox):
         """
         if label or label == '':
             self.label.setText(label)
+            self._h_collapsed = None
             return Success()
         else:
-            msg = "{0}set_label(): label Argument missing".format(self._insert)
+            msg = f"{self._insert}set_label(): label Argument missing"
             self._log.error(msg)
             return Failure(msg)
 
@@ -431,13 +708,12 @@ class GenericCheckBoxField(QWidget):
     def __init__(self, parent: QWidget = None, title: str = None) -> None:
         QWidget.__init__(self, parent)
 
-        container = QHBoxLayout()
+        container = QHBoxLayout(self)
         container.setContentsMargins(0, 0, 0, 0)
         self.check_box = QCheckBox(title)
-        container.addSpacerItem(QSpacerItem(25, 25))
+        container.addSpacerItem(_spacer(25))
         container.addWidget(self.check_box)
         container.addStretch(1)
-        self.setLayout(container)
 
 
 class GenericDropDownField(QWidget):
@@ -445,22 +721,21 @@ class GenericDropDownField(QWidget):
 
     def __init__(self, title: str, options: List[str], title_width: int = 200, parent=None) -> None:
         QWidget.__init__(self, parent)
+        _install_app_style(_FIELD_QSS)
 
-        container = QHBoxLayout()
+        container = QHBoxLayout(self)
         container.setContentsMargins(0, 0, 0, 0)
-        self.title = QLabel("<b>{0}</b>:".format(title))
-        self.title.setMinimumWidth(title_width)
-        self.title.setMaximumWidth(title_width)
+        self.title = _bold_label(title + ':')
+        self.title.setFixedWidth(title_width)
         self.value = QComboBox()
-        self.value.setStyleSheet('background: gray; selection-background-color: darkgray; border-radius: 7px;')
+        self.value.setProperty('class', 'field')
         self.value.addItems(options)
         self.value.setMinimumWidth(300)
-        container.addSpacerItem(QSpacerItem(25, 25))
+        container.addSpacerItem(_spacer(25))
         container.addWidget(self.title)
-        container.addSpacerItem(QSpacerItem(25, 25))
+        container.addSpacerItem(_spacer(25))
         container.addWidget(self.value)
         container.addStretch(1)
-        self.setLayout(container)
 
 
 class GenericTextField(QHBoxLayout):
@@ -469,32 +744,26 @@ class GenericTextField(QHBoxLayout):
                  value1_width: int = 200, value2_width: int = 200) -> None:
         QHBoxLayout.__init__(self)
         self.setContentsMargins(0, 0, 0, 0)
-        style = 'background: gray; selection-background-color: darkgray; border-radius: 7px;'
+        _install_app_style(_FIELD_QSS)
 
-        wrapper = QHBoxLayout()
-        wrapper.setContentsMargins(0, 0, 0, 0)
-        self.addLayout(wrapper)
-        self.title1 = QLabel("<b>{0}</b>".format(label[0]))
+        self.title1 = _bold_label(label[0])
 
-        self.title1.setMinimumWidth(title1_width)
-        self.title1.setMaximumWidth(title1_width)
+        self.title1.setFixedWidth(title1_width)
         self.value1 = QLineEdit('')
-        self.value1.setStyleSheet(style)
-        self.value1.setMinimumWidth(value1_width)
-        self.value1.setMaximumWidth(value1_width)
-        wrapper.addSpacerItem(QSpacerItem(25, 15))
-        wrapper.addWidget(self.title1)
-        wrapper.addWidget(self.value1)
+        self.value1.setProperty('class', 'field')
+        self.value1.setFixedWidth(value1_width)
+        self.addSpacerItem(_spacer(25, 15))
+        self.addWidget(self.title1)
+        self.addWidget(self.value1)
         if double_it:
-            self.title2 = QLabel("<b>{0}</b>".format(label[1]))
-            self.title2.setMinimumWidth(title2_width)
-            self.title2.setMaximumWidth(title2_width)
+            self.title2 = _bold_label(label[1])
+            self.title2.setFixedWidth(title2_width)
             self.value2 = QLineEdit('')
-            self.value2.setStyleSheet(style)
+            self.value2.setProperty('class', 'field')
             self.value2.setMinimumWidth(value2_width)
-            wrapper.addSpacerItem(QSpacerItem(25, 25))
-            wrapper.addWidget(self.title2)
-            wrapper.addWidget(self.value2)
+            self.addSpacerItem(_spacer(25))
+            self.addWidget(self.title2)
+            self.addWidget(self.value2)
 
         self.addStretch(1)
 
@@ -506,61 +775,53 @@ class GenericLineEditField(QHBoxLayout):
                  parent=None) -> None:
         QHBoxLayout.__init__(self)
         self.setContentsMargins(0, 0, 0, 0)
-        style = 'background: gray; selection-background-color: darkgray; border-radius: 7px;'
-
-        wrapper = QHBoxLayout()
-        wrapper.setContentsMargins(0, 0, 0, 0)
-        self.addLayout(wrapper)
-        self.title = QLabel("<b>{0}</b>:".format(title))
-        self.title.setMinimumWidth(title_width)
-        self.title.setMaximumWidth(title_width)
+        _install_app_style(_FIELD_QSS)
+
+        self.title = _bold_label(title + ':')
+        self.title.setFixedWidth(title_width)
         # self.title.setStyleSheet('color: #07080a;font-size:9pt')
         self.value = QLineEdit(default_value)
-        self.value.setStyleSheet('background: gray; selection-background-color: darkgray; border-radius: 7px;')
+        self.value.setProperty('class', 'field')
 
-        self.value.setMinimumWidth(value_width)
-        self.value.setMaximumWidth(value_width)
-        wrapper.addSpacerItem(QSpacerItem(25, 25))
-        wrapper.addWidget(self.title)
-        wrapper.addSpacerItem(QSpacerItem(25, 25))
-        wrapper.addWidget(self.value)
-        wrapper.addStretch(1)
+        self.value.setFixedWidth(value_width)
+        self.addSpacerItem(_spacer(25))
+        self.addWidget(self.title)
+        self.addSpacerItem(_spacer(25))
+        self.addWidget(self.value)
+        self.addStretch(1)
 
 
 class ComboBoxTextField(QHBoxLayout):
     """Create a combo box with a text field."""
     def __init__(self, label1: str, label2: str = None, title_width: int = 120, title_width2: int = 140,
                  combo_items: List[str] = None, size_value1: int = 200, size_value2: int = 200, double_it=False,
-                 parent: QWidget = None):
+                 parent: QWidget = None, items_presorted: bool = False):
         QHBoxLayout.__init__(self, parent)
         self.setContentsMargins(0, 0, 0, 0)
-        style = 'background: gray; selection-background-color: darkgray; border-radius: 7px;'
+        _install_app_style(_FIELD_QSS)
 
-        wrapper = QHBoxLayout()
-        wrapper.setContentsMargins(0, 0, 0, 0)
-        self.addLayout(wrapper)
-        self.title1 = QLabel("<b>{0}</b>".format(label1))
+        self.title1 = _bold_label(label1)
 
-        self.title1.setMinimumWidth(title_width)
-        self.title1.setMaximumWidth(title_width)
+        self.title1.setFixedWidth(title_width)
         self.value1 = QComboBox()
-        self.value1.addItems(sorted(combo_items))
-        self.value1.setStyleSheet(style)
-        self.value1.setMinimumWidth(size_value1)
-        self.value1.setMaximumWidth(size_value1)
-        wrapper.addSpacerItem(QSpacerItem(25, 15))
-        wrapper.addWidget(self.title1)
-        wrapper.addWidget(self.value1)
+        # FILL WITHOUT EMITTING A currentIndexChanged PER ITEM
+        self.value1.blockSignals(True)
+        self.value1.addItems(combo_items if items_presorted else sorted(combo_items))
+        self.value1.blockSignals(False)
+        self.value1.setProperty('class', 'field')
+        self.value1.setFixedWidth(size_value1)
+        self.addSpacerItem(_spacer(25, 15))
+        self.addWidget(self.title1)
+        self.addWidget(self.value1)
         if double_it:
-            self.title2 = QLabel("<b>{0}</b>".format(label2))
-            self.title2.setMinimumWidth(title_width2)
-            self.title2.setMaximumWidth(title_width2)
+            self.title2 = _bold_label(label2)
+            self.title2.setFixedWidth(title_width2)
             self.value2 = QLineEdit('')
-            self.value2.setStyleSheet(style)
+            self.value2.setProperty('class', 'field')
             self.value2.setMinimumWidth(size_value2)
-            wrapper.addSpacerItem(QSpacerItem(25, 25))
-            wrapper.addWidget(self.title2)
-            wrapper.addWidget(self.value2)
+            self.addSpacerItem(_spacer(25))
+            self.addWidget(self.title2)
+            self.addWidget(self.value2)
 
         self.addStretch(1)
 
@@ -572,34 +833,28 @@ class SpinBoxField(QHBoxLayout):
                  parent: QWidget=None) -> None:
         QHBoxLayout.__init__(self, parent)
         self.setContentsMargins(0, 0, 0, 0)
-        style = 'background: gray; selection-background-color: darkgray; border-radius: 7px;'
+        _install_app_style(_FIELD_QSS)
 
-        wrapper = QHBoxLayout()
-        wrapper.setContentsMargins(0, 0, 0, 0)
-        self.addLayout(wrapper)
-        self.title1 = QLabel("<b>{0}</b>".format(label1))
+        self.title1 = _bold_label(label1)
         t1w = title_width1
         t2w = title_width2
 
-        self.title1.setMinimumWidth(t1w)
-        self.title1.setMaximumWidth(t1w)
+        self.title1.setFixedWidth(t1w)
         self.value1 = QSpinBox()
-        self.value1.setStyleSheet(style)
-        self.value1.setMinimumWidth(value1_width)
-        self.value1.setMaximumWidth(value1_width)
-        wrapper.addSpacerItem(QSpacerItem(spacer_width, 15))
-        wrapper.addWidget(self.title1)
-        wrapper.addWidget(self.value1)
+        self.value1.setProperty('class', 'field')
+        self.value1.setFixedWidth(value1_width)
+        self.addSpacerItem(_spacer(spacer_width, 15))
+        self.addWidget(self.title1)
+        self.addWidget(self.value1)
         if double_it:
-            self.title2 = QLabel("<b>{0}</b>".format(label2))
-            self.title2.setMinimumWidth(t2w)
-            self.title2.setMaximumWidth(t2w)
+            self.title2 = _bold_label(label2)
+            self.title2.setFixedWidth(t2w)
             self.value2 = QSpinBox()
-            self.value2.setStyleSheet(style)
+            self.value2.setProperty('class', 'field')
             self.value2.setMinimumWidth(value2_width)
-            wrapper.addSpacerItem(QSpacerItem(spacer_width, 25))
-            wrapper.addWidget(self.title2)
-            wrapper.addWidget(self.value2)
+            self.addSpacerItem(_spacer(spacer_width))
+            self.addWidget(self.title2)
+            self.addWidget(self.value2)
 
         self.addStretch(1)
 
@@ -641,11 +896,16 @@ class AddRemoveBlock(QWidget):
         QWidget.__init__(self, parent)
         if set_bg_color:
             if not background_color:
-                self.setStyleSheet('background-color:#959da5')
+                color = QColor('#959da5')
+            elif isinstance(background_color, tuple):
+                color = QColor(*background_color)
             else:
-                self.setStyleSheet('background-color:{0}'.format(background_color))
+                color = QColor(background_color)
+            palette = self.palette()
+            palette.setColor(self.backgroundRole(), color)
+            self.setPalette(palette)
+            self.setAutoFillBackground(True)
         self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
-        self.autoFillBackground()
         self.title_widget = None
         self.title = title
         self.index = index
@@ -673,61 +933,68 @@ class AddRemoveBlock(QWidget):
         # ADD HEADER
         h_title_container = QHBoxLayout()
         h_title_container.setContentsMargins(0, 0, 0, 0)
-        h_title_container.addSpacerItem(QSpacerItem(25, 25))
-        self.title_widget = QLabel("<b>{0}</b>:".format(self.title))
+        h_title_container.addSpacerItem(_spacer(25))
+        self.title_widget = _bold_label(self.title + ':')
         self.title_widget.setStyleSheet('color: #382500;font-size:10pt')
-        self.title_widget.setMinimumWidth(200)
-        self.title_widget.setMaximumWidth(200)
+        self.title_widget.setFixedWidth(200)
         h_title_container.addWidget(self.title_widget)
-        h_title_container.addSpacerItem(QSpacerItem(50, 25))
+        h_title_container.addSpacerItem(_spacer(50))
         h_title_container.addStretch(1)
         self.more_btn = QPushButton('+')
         self.more_btn.setFlat(True)
         self.more_btn.setStyleSheet('color: #132333;font-size:16pt; font-style:bold')
-        self.more_btn.setMaximumWidth(35)
-        self.more_btn.setMaximumHeight(35)
-        self.more_btn.setMinimumWidth(35)
-        self.more_btn.setMinimumHeight(35)
+        self.more_btn.setFixedSize(35, 35)
         self.more_btn.index = index
-        self.more_btn.clicked.connect(lambda: self.add_callback(index=self.index + 1))
+        self.more_btn.clicked.connect(self._on_more)
         h_title_container.addWidget(self.more_btn)
-        h_title_container.addSpacerItem(QSpacerItem(15, 15))
+        h_title_container.addSpacerItem(_spacer(15, 15))
         self.less_btn = QPushButton('x')
         self.less_btn.setFlat(True)
         self.less_btn.setStyleSheet('color: #132333;font-size:16pt; font-style:bold')
         self.less_btn.type = 'sequence'
-        self.less_btn.setMaximumWidth(35)
-        self.less_btn.setMaximumHeight(35)
-        self.less_btn.setMinimumWidth(35)
-        self.less_btn.setMinimumHeight(35)
+        self.less_btn.setFixedSize(35, 35)
         self.less_btn.index = index
-        self.less_btn.clicked.connect(lambda: self.remove_callback(index=self.index))
+        self.less_btn.clicked.connect(self._on_less)
         h_title_container.addWidget(self.less_btn)
-        h_title_container.addSpacerItem(QSpacerItem(50, 25))
-        self.v_container.addSpacerItem(QSpacerItem(10, 10))
+        h_title_container.addSpacerItem(_spacer(50))
+        self.v_container.addSpacerItem(_spacer(10, 10))
         self.v_container.addLayout(h_title_container)
         self._add_options()
-        self.v_container.addSpacerItem(QSpacerItem(10, 20))
+        self.v_container.addSpacerItem(_spacer(10, 20))
         self.wrapper.addLayout(self.v_container)
 
-    def _remove_container(self, index: int, container: QWidget) -> None:
+    def _on_more(self) -> None:
+        """Request a new block after this one."""
+        self.add_callback(index=self.index + 1)
+
+    def _on_less(self) -> None:
+        """Request removal of this block."""
+        self.remove_callback(index=self.index)
+
+    def _remove_container(self, index: int, container: QLayout) -> None:
         """Remove a container.
 
         Args:
             index: index of container to remove.
+            container: layout to empty.
         """
         # REMOVE FROM VALUES TRACKER
 
         # CLEAN CONTAINER
         # REMOVE THE EXISTING ITEMS FROM THE ATTRIBUTE DATA SECTION
-        for i in reversed(range(container.count())):
-            widget = container.itemAt(i).widget()
-            if widget:
-                container.itemAt(i).widget().setParent(None)
-        child = container.takeAt(0)
-        while child:
-            del child
+        owner = container.parentWidget()
+        if owner:
+            owner.setUpdatesEnabled(False)
+        while True:
             child = container.takeAt(0)
+            if child is None:
+                break
+            widget = child.widget()
+            if widget is not None:
+                widget.deleteLater()
+            del child
+        if owner:
+            owner.setUpdatesEnabled(True)
         self.remove_callback(index=index)
 
 
@@ -761,11 +1028,13 @@ class FrameBoxWidget(QFrame):
             style_sheet: Style sheet for frame
         """
         QFrame.__init__(self, parent)
-        style = "QFrame{border: 1px solid gray; border-radius: 5px;background-color: none;}"
-        if style_sheet:
-            style = style_sheet
 
         self.setMinimumWidth(minimum_width)
         self.setMinimumHeight(minimum_height)
         self.setFrameStyle(QFrame.Box)
-        self.setStyleSheet(style)
+        if style_sheet:
+            self.setStyleSheet(style_sheet)
+        else:
+            # ONLY OPT INTO THE DEFAULT STYLE WHEN THE CALLER DOES NOT REPLACE IT
+            self.setProperty('class', 'frame_box')
+            _install_app_style(_DEFAULT_FRAME_STYLE)
@@ -1,27 +1,81 @@
 """Module for messaging."""
-from typing import Self
+from typing import Callable
 
 # DEFAULT
+import functools
 import logging
 import os
 
 
+# Logger.set_debug_level VALUES TO LOGGING LEVELS
+_DEBUG_LEVELS = {
+    0: logging.DEBUG,
+    1: logging.ERROR,
+    2: logging.WARNING,
+    3: logging.INFO,
+    4: logging.CRITICAL
+}
+
+# DEFAULT LEVEL MAPS PER PLATFORM (background, foreground, bold/intensity)
+_BASE_LEVEL_MAPS = {
+    'posix': {
+        logging.DEBUG: (None, 'magenta', False),
+        logging.INFO: (None, 'green', False),
+        logging.WARNING: (None, 'yellow', False),
+        logging.ERROR: (None, 'red', False),
+        logging.CRITICAL: ('red', 'white', True)
+    },
+    'nt': {
+        logging.DEBUG: (None, 'magenta', True),
+        logging.INFO: (None, 'green', False),
+        logging.WARNING: (None, 'yellow', True),
+        logging.ERROR: (None, 'red', True),
+        logging.CRITICAL: ('red', 'white', True)
+    }
+}
+
+# CHANGES TO THE BASE LEVEL MAP FOR EACH COLOR SCHEME, SCHEME 0 IS THE BASE MAP
+_SCHEME_OVERRIDES = {
+    'posix': {
+        1: {logging.INFO: (None, 'cyan', False)},
+        2: {logging.INFO: (None, 'cyan', False)}
+    },
+    'nt': {
+        1: {logging.INFO: (None, 'cyan', False)},
+        2: {logging.INFO: (None, 'white', False), logging.CRITICAL: ('red', 'cyan', True)}
+    }
+}
+
+
 class Failure(int):
     """
     Failure Object class. To be used as a return object in method calls.
+
+    Notes:
+        Failure() without a message returns a shared instance, pass the message to the constructor rather than
+        setting it on a returned instance.
     """
+    _SINGLETON = None
 
     def __init__(self, message: str=None) -> None:
-        self._message = message
+        # THE SHARED INSTANCE IS INITIALIZED ONCE IN __new__, LEAVE IT UNTOUCHED ON LATER CALLS
+        if not self._is_shared():
+            self._message = message
 
     def __new__(cls, message: str=None) -> int:
+        # INSTANCES WITHOUT A MESSAGE ARE INTERCHANGEABLE, SO SHARE ONE PER CLASS
+        if message is None:
+            if cls.__dict__.get('_SINGLETON') is None:
+                cls._SINGLETON = int.__new__(cls, bool(0))
+                cls._SINGLETON._message = None
+            return cls._SINGLETON
         return int.__new__(cls, bool(0))
 
-    def __nonzero__(self) -> bool:
+    def __bool__(self) -> bool:
         return False
 
-    def __str__(self) -> Self:
-        return self
+    def __str__(self) -> str:
+        return str(self._message) if self._message is not None else type(self).__name__
 
     @property
     def message(self) -> str:
@@ -29,24 +83,45 @@ class Failure(int):
 
     @message.setter
     def message(self, value: str) -> None:
+        if self._is_shared():
+            raise AttributeError(f"{self.__class__.__name__}() without a message is shared, "
+                                 f"construct it with the message instead")
         self._message = value
 
+    def _is_shared(self) -> bool:
+        """Return whether this is the class's shared message-less instance."""
+        return self is type(self).__dict__.get('_SINGLETON')
+
 
 class Success(int):
     """
     Success Object class. To be used as a return object in method calls.
+
+    Notes:
+        Success() without a message returns a shared instance, pass the message to the constructor rather than
+        setting it on a returned instance.
     """
+    _SINGLETON = None
+
     def __init__(self, message: str = None) -> None:
-        self._message = message
+        # THE SHARED INSTANCE IS INITIALIZED ONCE IN __new__, LEAVE IT UNTOUCHED ON LATER CALLS
+        if not self._is_shared():
+            self._message = message
 
     def __new__(cls, message: str = None) -> int:
+        # INSTANCES WITHOUT A MESSAGE ARE INTERCHANGEABLE, SO SHARE ONE PER CLASS
+        if message is None:
+            if cls.__dict__.get('_SINGLETON') is None:
+                cls._SINGLETON = int.__new__(cls, bool(1))
+                cls._SINGLETON._message = None
+            return cls._SINGLETON
         return int.__new__(cls, bool(1))
 
-    def __nonzero__(self) -> bool:
+    def __bool__(self) -> bool:
         return True
 
-    def __str__(self) -> Self:
-        return self
+    def __str__(self) -> str:
+        return str(self._message) if self._message is not None else type(self).__name__
 
     @property
     def message(self) -> str:
@@ -54,18 +129,67 @@ class Success(int):
 
     @message.setter
     def message(self, value: str) -> None:
+        if self._is_shared():
+            raise AttributeError(f"{self.__class__.__name__}() without a message is shared, "
+                                 f"construct it with the message instead")
         self._message = value
 
+    def _is_shared(self) -> bool:
+        """Return whether this is the class's shared message-less instance."""
+        return self is type(self).__dict__.get('_SINGLETON')
+
+
+class LogMessage:
+    """Log message which defers building its text until a handler formats the record."""
+    __slots__ = ('_build', '_args', '_text')
+
+    def __init__(self, build: Callable[..., str], *args) -> None:
+        self._build = build
+        self._args = args
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._build(*self._args)
+        return self._text
+
+
+class CachedLogRecord(logging.LogRecord):
+    """Log record which merges its message and arguments once and reuses the result for every handler."""
+
+    def getMessage(self) -> str:
+        """Override class method."""
+        try:
+            return self._cached_message
+        except AttributeError:
+            self._cached_message = logging.LogRecord.getMessage(self)
+            return self._cached_message
+
 
 class Logger(logging.Logger):
     """Subclass of logging which implements colored output to shell."""
-    def __init__(self, name='Logger1', filename: str = None) -> None:
+    # LINE BREAKS WHICH ALIGN CONTINUATION LINES WITH THE FIRST LINE OF EACH MESSAGE TYPE
+    _NL = {
+        'info': "\n" + " " * 16,
+        'warning': "\n" + " " * 19,
+        'error': "\n" + " " * 17
+    }
+
+    def __init__(self, name='Logger1', filename: str = None, threadsafe: bool = True) -> None:
+        """
+        Initialization method for Logger
+        Args:
+            name: name of logger.
+            filename: if supplied, also write records to this file.
+            threadsafe: passed to the ColorHandler, see ColorHandler.__init__.
+        """
         self.name = name
         logging.Logger.__init__(self, self.name, logging.DEBUG)
-        self.handler = ColorHandler()
+        # RECORDS ARE FULLY HANDLED HERE, NEVER HAND THEM TO ANCESTOR HANDLERS
+        self.propagate = False
+        self.handler = ColorHandler(threadsafe=threadsafe)
         if filename:
-            # IF THE USER SENDS IN A FILENAME CONFIGURE AND ADD HANDLER
-            logging.basicConfig(filename=filename, level=logging.DEBUG)
+            # IF THE USER SENDS IN A FILENAME ADD A FILE HANDLER
             self.addHandler(logging.FileHandler(filename))
         else:
             self.handler.setLevel(logging.DEBUG)
@@ -76,20 +200,51 @@ class Logger(logging.Logger):
         self.handler.setFormatter(formatter)
         self.addHandler(self.handler)
 
+    def setLevel(self, level) -> None:
+        """Override class method to clear the isEnabledFor cache.
+
+        Notes:
+            This logger is built directly rather than through logging.getLogger, so the manager never clears
+            its per-level cache when levels change.
+        """
+        logging.Logger.setLevel(self, level)
+        self._cache.clear()
+
+    def findCaller(self, stack_info: bool = False, stacklevel: int = 1) -> tuple:
+        """Override class method to skip the stack walk unless a stack trace is requested.
+
+        Notes:
+            The formatters used by this logger never reference the caller, so records report an unknown
+            file, line and function. Call logging.Logger.findCaller directly if a custom formatter needs them.
+        """
+        if stack_info:
+            # ONE EXTRA LEVEL TO STEP OVER THIS OVERRIDE
+            return logging.Logger.findCaller(self, stack_info, stacklevel + 1)
+        return "(unknown file)", 0, "(unknown function)", None
+
+    def makeRecord(self, name, level, fn, lno, msg, args, exc_info, func=None, extra=None,
+                   sinfo=None) -> CachedLogRecord:
+        """Override class method so every handler shares one formatted message per record."""
+        record = CachedLogRecord(name, level, fn, lno, msg, args, exc_info, func, sinfo)
+        if extra is not None:
+            for key in extra:
+                if (key in ["message", "asctime"]) or (key in record.__dict__):
+                    raise KeyError("Attempt to overwrite %r in LogRecord" % key)
+                record.__dict__[key] = extra[key]
+        return record
+
     def show_level(self, state: bool = True) -> None:
         """Show or hide the level data associated with this logger.
 
         Args:
             state: Visibility state of level display.
         """
+        # THE HANDLER IS ATTACHED IN __init__, ONLY ITS FORMATTER CHANGES
         if state:
             formatter = logging.Formatter("%(levelname)s: {:<10}%(message)s".format(''))
-            self.handler.setFormatter(formatter)
-            self.addHandler(self.handler)
         else:
             formatter = logging.Formatter("{:<4}%(message)s".format(''))
-            self.handler.setFormatter(formatter)
-            self.addHandler(self.handler)
+        self.handler.setFormatter(formatter)
 
     def set_color_scheme(self, scheme: int = 0) -> None:
         """Set the color scheme of the logger.
@@ -112,27 +267,26 @@ class Logger(logging.Logger):
                2 - Equivalent of calling logging.WARNING
                3 - Equivalent of calling logging.INFO
                4 - Equivalent of calling logging.CRITICAL
+
+        Raises:
+            TypeError: level is not an int.
+            ValueError: level is outside of the supported range.
         """
-        if type(level) != int:
-            print("level must be of type (int) with range 0-4")
-        if level == 4:
-            self.setLevel(logging.CRITICAL)
-        elif level == 3:
-            self.setLevel(logging.INFO)
-        elif level == 2:
-            self.setLevel(logging.WARNING)
-        elif level == 1:
-            self.setLevel(logging.ERROR)
-        elif level == 0:
-            self.setLevel(logging.DEBUG)
-        else:
-            print("level Not supported")
+        if not isinstance(level, int):
+            raise TypeError("level must be of type (int) with range 0-4")
+        if level not in _DEBUG_LEVELS:
+            raise ValueError(f"level {level} Not supported, must be in range 0-4")
+        self.setLevel(_DEBUG_LEVELS[level])
 
     @classmethod
     def format_msg(cls, _module: str = None, _class: str = None, _method: str = None, _property: str = None,
-                   msg_list: str = None, msg_type: str = 'info') -> str:
+                   msg_list: str = None, msg_type: str = 'info') -> LogMessage:
         """Format a message for logging.
 
+        Notes:
+            The text is only built when a handler emits the record, so pass the result straight to a log call,
+            e.g. logger.debug(Logger.format_msg(...)). Use str() on the result if the text is needed directly.
+
         Args:
             _module: path to module from which log is being called. (optional)
             _class: class name from which msg originated. (optional)
@@ -140,27 +294,51 @@ class Logger(logging.Logger):
             msg_list: list of message data. Each entry in the list is a new line in the message output.
             msg_type: type of message to format for. Valid values are: info, warning, error
         """
+        return LogMessage(cls._build_msg, _module, _class, _method, _property, msg_list, msg_type)
+
+    @classmethod
+    def _build_msg(cls, _module: str, _class: str, _method: str, _property: str, msg_list: str,
+                   msg_type: str) -> str:
+        """Build the text of a message created by format_msg."""
         _msg_list = msg_list
         if not _msg_list:
             _msg_list = []
-        new_line_break = "\n{0:>16}".format(" ")
-        if msg_type == 'warning':
-            new_line_break = "\n{0:>19}".format(" ")
-        elif msg_type == 'error':
-            new_line_break = "\n{0:>17}".format(" ")
-        msg = ""
+        new_line_break = cls._NL.get(msg_type, cls._NL['info'])
+        parts = []
 
         if _module:
-            msg += "{0}".format(_module)
+            parts.append(_module)
         if _class:
-            msg += ".{0}".format(_class)
+            parts.append('.' + _class)
         if _method:
-            msg += ".{0}()".format(_method)
+            parts.append('.' + _method + '()')
         if _property:
-            msg += ".{0}".format(_property)
-        msg += new_line_break
-        msg += "{0}".format(new_line_break).join(msg_list)
-        return msg
+            parts.append('.' + _property)
+        parts.append(new_line_break)
+        parts.append(new_line_break.join(_msg_list))
+        return ''.join(parts)
+
+
+class _NoLock:
+    """Stand-in for the handler RLock which never blocks, used by ColorHandler(threadsafe=False)."""
+
+    def acquire(self, *args, **kwargs) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+    def _at_fork_reinit(self) -> None:
+        pass
+
+    def __enter__(self) -> bool:
+        return True
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_LOCK = _NoLock()
 
 
 class ColorHandler(logging.StreamHandler):
@@ -178,21 +356,60 @@ class ColorHandler(logging.StreamHandler):
     }
 
     # CONSTRUCT LEVEL MAP (background, foreground, bold/intensity)
-    level_map = {
-        logging.DEBUG: (None, 'magenta', False),
-        logging.INFO: (None, 'green', False),
-        logging.WARNING:  (None, 'yellow', False),
-        logging.ERROR: (None, 'red', False),
-        logging.CRITICAL: ('red', 'white', True)
-    }
+    level_map = dict(_BASE_LEVEL_MAPS['posix'])
 
     csi = '\x1b['
     reset = '\x1b[0m'
 
+    def __init__(self, stream=None, threadsafe: bool = True) -> None:
+        """
+        Initialization method for ColorHandler
+        Args:
+            stream: stream to write to, defaults to sys.stderr.
+            threadsafe: when False no lock is taken around emit. Only use this when every record is logged
+                        from a single thread, otherwise output from concurrent threads can interleave.
+        """
+        # MUST BE SET BEFORE THE BASE CLASS CALLS createLock()
+        self._threadsafe = threadsafe
+        logging.StreamHandler.__init__(self, stream)
+        # A STREAM DOES NOT CHANGE TTY STATE, SO ONLY CHECK IT WHEN THE STREAM IS SET
+        self._is_tty = self._check_tty(self.stream)
+        self._bind_format()
+        self._flush_interval = 64
+        self._unflushed = 0
+        self._prefix_by_level = {}
+        self._rebuild_prefixes()
+
+    def createLock(self) -> None:
+        """Override class method, a handler which is not thread safe gets a lock which does nothing."""
+        if self._threadsafe:
+            logging.StreamHandler.createLock(self)
+        else:
+            self.lock = _NO_LOCK
+
     @property
-    def is_tty(self):
-        isatty = getattr(self.stream, 'isatty', None)
-        return isatty and isatty()
+    def is_tty(self) -> bool:
+        return self._is_tty
+
+    @staticmethod
+    def _check_tty(stream) -> bool:
+        """Return whether stream is attached to a terminal."""
+        isatty = getattr(stream, 'isatty', None)
+        return bool(isatty and isatty())
+
+    def setStream(self, stream):
+        """Override class method to refresh the cached tty state."""
+        result = logging.StreamHandler.setStream(self, stream)
+        self._is_tty = self._check_tty(self.stream)
+        self._bind_format()
+        return result
+
+    def _bind_format(self) -> None:
+        """Route format() straight to the base class when the stream is not a tty and never gets colorized."""
+        if self._is_tty:
+            self.__dict__.pop('format', None)
+        else:
+            self.format = functools.partial(logging.StreamHandler.format, self)
 
     def update_color_scheme(self, scheme: int = 0) -> None:
         """Update the color scheme of the logger.
@@ -203,78 +420,39 @@ class ColorHandler(logging.StreamHandler):
         Args:
             scheme: color scheme to use 0 default, 1 alternate INFO
         """
-        if scheme == 0:
-            # DEFAULT
-            if os.name == 'nt':
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', True),
-                    logging.INFO: (None, 'green', False),
-                    logging.WARNING:  (None, 'yellow', True),
-                    logging.ERROR: (None, 'red', True),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-            else:
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', False),
-                    logging.INFO: (None, 'green', False),
-                    logging.WARNING:  (None, 'yellow', False),
-                    logging.ERROR: (None, 'red', False),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-        elif scheme == 1:
-            # SWITCH INFO TO CYAN
-            if os.name == 'nt':
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', True),
-                    logging.INFO: (None, 'cyan', False),
-                    logging.WARNING:  (None, 'yellow', True),
-                    logging.ERROR: (None, 'red', True),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-            else:
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', False),
-                    logging.INFO: (None, 'cyan', False),
-                    logging.WARNING:  (None, 'yellow', False),
-                    logging.ERROR: (None, 'red', False),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-        elif scheme == 2:
-            # SWITCH INFO TO CYAN
-            if os.name == 'nt':
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', True),
-                    logging.INFO: (None, 'white', False),
-                    logging.WARNING: (None, 'yellow', True),
-                    logging.ERROR: (None, 'red', True),
-                    logging.CRITICAL: ('red', 'cyan', True)
-                }
-            else:
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', False),
-                    logging.INFO: (None, 'cyan', False),
-                    logging.WARNING: (None, 'yellow', False),
-                    logging.ERROR: (None, 'red', False),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-        else:
-            # DEFAULT, IN CASE WE GET A NON VALID SCHEME
-            if os.name == 'nt':
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', True),
-                    logging.INFO: (None, 'green', False),
-                    logging.WARNING:  (None, 'yellow', True),
-                    logging.ERROR: (None, 'red', True),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
-            else:
-                self.level_map = {
-                    logging.DEBUG: (None, 'magenta', False),
-                    logging.INFO: (None, 'green', False),
-                    logging.WARNING:  (None, 'yellow', False),
-                    logging.ERROR: (None, 'red', False),
-                    logging.CRITICAL: ('red', 'white', True)
-                }
+        platform = 'nt' if os.name == 'nt' else 'posix'
+        # UNKNOWN SCHEMES FALL BACK TO THE DEFAULT
+        overrides = _SCHEME_OVERRIDES[platform].get(scheme, {})
+        self.level_map = {**_BASE_LEVEL_MAPS[platform], **overrides}
+        self._rebuild_prefixes()
+
+    def _rebuild_prefixes(self) -> None:
+        """Precompute the escape sequence which opens the colored output of each level in level_map."""
+        prefixes = {}
+        for level, (bg, fg, bold) in self.level_map.items():
+            params = []
+            if bg in self.color_map:
+                params.append(str(self.color_map[bg] + 40))
+            if fg in self.color_map:
+                params.append(str(self.color_map[fg] + 30))
+            if bold:
+                params.append('1')
+            if params:
+                prefixes[level] = f"{self.csi}{';'.join(params)}m"
+        self._prefix_by_level = prefixes
+
+    def set_flush_interval(self, interval: int = 64) -> None:
+        """Set how many records below WARNING are written between stream flushes.
+
+        Notes:
+            Pending output is flushed by logging.shutdown() at interpreter exit. Use 1 to flush every record.
+
+        Args:
+            interval: number of records per flush, must be at least 1.
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be at least 1, got {interval}")
+        self._flush_interval = interval
 
     def emit(self, record: logging.LogRecord) -> None:
         """Override class method.
@@ -283,14 +461,14 @@ class ColorHandler(logging.StreamHandler):
             record: log record.
         """
         try:
+            # format() ALREADY COLORIZES FOR A TTY, WRITE THE MESSAGE AND TERMINATOR IN ONE CALL
             message = self.format(record)
-            stream = self.stream
-            if not self.is_tty:
-                stream.write(message)
-            else:
-                self.output_colorized(message)
-            stream.write(getattr(self, 'terminator', '\n'))
-            self.flush()
+            self.stream.write(message + getattr(self, 'terminator', '\n'))
+            # WARNINGS AND ABOVE ARE FLUSHED RIGHT AWAY, LOWER LEVELS ONCE PER FLUSH INTERVAL
+            self._unflushed += 1
+            if record.levelno >= logging.WARNING or self._unflushed >= self._flush_interval:
+                self.flush()
+                self._unflushed = 0
         except (KeyboardInterrupt, SystemExit):
             raise
         except:
@@ -303,11 +481,13 @@ class ColorHandler(logging.StreamHandler):
             record: log record
         """
         message = logging.StreamHandler.format(self, record)
-        if self.is_tty:
-            parts = message.split('\n', 1)
-            parts[0] = self.colorize(parts[0], record)
-            message = '\n'.join(parts)
-        return message
+        if not self._is_tty:
+            return message
+        # ONLY THE FIRST LINE IS COLORIZED
+        idx = message.find('\n')
+        if idx < 0:
+            return self.colorize(message, record)
+        return self.colorize(message[:idx], record) + message[idx:]
 
     def colorize(self, message: str, record: logging.LogRecord) -> str:
         """Format data with color.
@@ -316,18 +496,8 @@ class ColorHandler(logging.StreamHandler):
             message: message to format.
             record: log record.
         """
-        if record.levelno in self.level_map:
-            bg, fg, bold = self.level_map[record.levelno]
-            params = []
-            if bg in self.color_map:
-                params.append(str(self.color_map[bg] + 40))
-            if fg in self.color_map:
-                params.append(str(self.color_map[fg] + 30))
-            if bold:
-                params.append('1')
-            if params:
-                message = ''.join((self.csi, ';'.join(params), 'm', message, self.reset))
-        return message
+        prefix = self._prefix_by_level.get(record.levelno)
+        return prefix + message + self.reset if prefix else message
 
     def output_colorized(self, message: str) -> None:
         self.stream.write(message)
\ No newline at end of file